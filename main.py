@@ -2,30 +2,47 @@ import logging
 import re
 import uuid
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Literal, Optional
 
+from apscheduler.events import EVENT_JOB_MISSED
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.date import DateTrigger
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, EmailStr, HttpUrl, field_validator
 
+from notify_manager.admission import AdmissionController
+from notify_manager.config.config import app_config
 from notify_manager.manager import get_notify_manager
+from notify_manager.webhooks import WebhookDispatcher, validate_callback_url
 from logger import setup_logging
 
 scheduler = AsyncIOScheduler()
 notify_manager = None
+webhook_dispatcher = None
+admission = None
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global notify_manager
+    global notify_manager, webhook_dispatcher, admission
     setup_logging()
     notify_manager = await get_notify_manager()
+    admission = AdmissionController(
+        rates=app_config.admission.rates,
+        default_rate=app_config.admission.default_rate,
+        slot_seconds=app_config.admission.slot_seconds,
+        jitter_window=app_config.admission.jitter_window,
+        policy=app_config.admission.policy,
+    )
+    webhook_dispatcher = WebhookDispatcher(**asdict(app_config.webhook))
+    scheduler.add_listener(on_job_missed, EVENT_JOB_MISSED)
     scheduler.start()
     yield
     scheduler.shutdown()
+    await webhook_dispatcher.close()
 
 
 app = FastAPI(
@@ -42,6 +59,9 @@ class NotificationRequest(BaseModel):
     tg_id: str
     notification_date: datetime
     message: str = "Напоминание"
+    client_id: Optional[str] = None
+    callback_url: Optional[HttpUrl] = None
+    on_overload: Optional[Literal["reject", "suggest", "spread"]] = None
 
     @field_validator("phone")
     @classmethod
@@ -58,6 +78,23 @@ class NotificationRequest(BaseModel):
             raise ValueError("Telegram ID должен быть числом")
         return v
 
+    @field_validator("callback_url")
+    @classmethod
+    def validate_callback_url(cls, v):
+        if v is not None:
+            validate_callback_url(str(v))
+        return v
+
+
+class WebhookRequest(BaseModel):
+    callback_url: HttpUrl
+
+    @field_validator("callback_url")
+    @classmethod
+    def validate_callback_url(cls, v):
+        validate_callback_url(str(v))
+        return v
+
 
 class NotificationResponse(BaseModel):
     status: str
@@ -68,22 +105,71 @@ class NotificationResponse(BaseModel):
 
 notifications_db = []
 scheduled_jobs: Dict[str, str] = {}
+client_webhooks: Dict[str, str] = {}
 
 
-async def send_notification(notification_id: str):
-    notification = next(
-        (n for n in notifications_db if n["id"] == notification_id), None
+def notify_status_changed(notification: dict):
+    """
+    Ставит в очередь вебхук об изменении статуса уведомления.
+    Адрес уведомления имеет приоритет над адресом клиента.
+    """
+    callback_url = notification.get("callback_url") or client_webhooks.get(
+        notification.get("client_id")
+    )
+    if not callback_url or webhook_dispatcher is None:
+        return
+
+    webhook_dispatcher.enqueue(
+        callback_url,
+        {
+            "notification_id": notification["id"],
+            "client_id": notification.get("client_id"),
+            "status": notification["status"],
+            "sent_at": notification["sent_at"].isoformat(),
+        },
     )
 
+
+def get_notification(notification_id: str) -> Optional[dict]:
+    return next((n for n in notifications_db if n["id"] == notification_id), None)
+
+
+def on_job_missed(event):
+    """
+    APScheduler пропускает задачи, опоздавшие больше чем на misfire_grace_time;
+    send_notification для них не вызывается, поэтому слот освобождается здесь.
+    """
+    notification = get_notification(event.job_id)
+    scheduled_jobs.pop(event.job_id, None)
+
     if not notification:
         return
 
-    result = await notify_manager.send_notify(
-        phone=notification.get("phone"),
-        email=notification.get("email"),
-        tg_id=notification.get("tg_id"),
-        message=notification.get("message"),
-    )
+    logger.warning(f"Notification {event.job_id} missed its scheduled time")
+    admission.release(notification["channel"], notification["scheduled_time"])
+    notification["status"] = "missed"
+    notification["sent_at"] = datetime.now()
+    notify_status_changed(notification)
+
+
+async def send_notification(notification_id: str):
+    notification = get_notification(notification_id)
+
+    if not notification:
+        return
+
+    result = None
+    try:
+        result = await notify_manager.send_notify(
+            phone=notification.get("phone"),
+            email=notification.get("email"),
+            tg_id=notification.get("tg_id"),
+            message=notification.get("message"),
+        )
+    except Exception as err:
+        logger.error(f"Failed to send notification {notification_id}: {err}")
+    finally:
+        admission.release(notification["channel"], notification["scheduled_time"])
 
     task_status = "sent"
     if not result or result.get("error"):
@@ -91,6 +177,7 @@ async def send_notification(notification_id: str):
 
     notification["status"] = task_status
     notification["sent_at"] = datetime.now()
+    notify_status_changed(notification)
 
     job_id = scheduled_jobs.get(notification_id)
     if job_id:
@@ -104,11 +191,33 @@ async def schedule_notification(request: NotificationRequest):
             status_code=400, detail="Дата уведомления должна быть в будущем"
         )
 
+    decision = admission.admit(
+        channel=notify_manager.primary_channel,
+        when=request.notification_date,
+        policy=request.on_overload,
+    )
+    if not decision.accepted:
+        raise HTTPException(
+            status_code=429,
+            detail={
+                "message": "Превышена пропускная способность канала на это время",
+                "channel": decision.channel,
+                "suggested_time": (
+                    decision.suggested_time.isoformat()
+                    if decision.suggested_time
+                    else None
+                ),
+            },
+        )
+
     notification_id = str(uuid.uuid4())
 
     notification_data = {
         "id": notification_id,
         **request.model_dump(),
+        "callback_url": str(request.callback_url) if request.callback_url else None,
+        "channel": decision.channel,
+        "scheduled_time": decision.scheduled_time,
         "created_at": datetime.now(),
         "status": "scheduled",
     }
@@ -117,7 +226,7 @@ async def schedule_notification(request: NotificationRequest):
 
     job = scheduler.add_job(
         send_notification,
-        trigger=DateTrigger(run_date=request.notification_date),
+        trigger=DateTrigger(run_date=decision.scheduled_time),
         args=[notification_id],
         id=notification_id,
         misfire_grace_time=60,
@@ -129,7 +238,7 @@ async def schedule_notification(request: NotificationRequest):
         status="success",
         message="ok",
         notification_id=notification_id,
-        scheduled_time=request.notification_date,
+        scheduled_time=decision.scheduled_time,
     )
 
 
@@ -138,6 +247,19 @@ async def get_notifications():
     return {"total": len(notifications_db), "notifications": notifications_db}
 
 
+@app.put("/clients/{client_id}/webhook")
+async def set_client_webhook(client_id: str, request: WebhookRequest):
+    client_webhooks[client_id] = str(request.callback_url)
+    return {"status": "success", "client_id": client_id}
+
+
+@app.delete("/clients/{client_id}/webhook")
+async def delete_client_webhook(client_id: str):
+    if client_webhooks.pop(client_id, None) is None:
+        raise HTTPException(status_code=404, detail="Вебхук клиента не найден")
+    return {"status": "success", "client_id": client_id}
+
+
 @app.get("/")
 async def root():
     return {
@@ -145,6 +267,8 @@ async def root():
         "endpoints": {
             "schedule_notification": "POST /schedule-notification",
             "get_notifications": "GET /notifications",
+            "set_client_webhook": "PUT /clients/{client_id}/webhook",
+            "delete_client_webhook": "DELETE /clients/{client_id}/webhook",
         },
     }
 
@@ -0,0 +1,214 @@
+import logging
+import random
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionPolicy(Enum):
+    REJECT = "reject"
+    SUGGEST = "suggest"
+    SPREAD = "spread"
+
+
+@dataclass(frozen=True)
+class AdmissionDecision:
+    accepted: bool
+    channel: str
+    scheduled_time: datetime
+    suggested_time: Optional[datetime] = None
+
+
+class SlotLoadIndex:
+    """
+    Индекс запланированной нагрузки по (канал, временной слот).
+
+    Проверка заполненности слота - O(1). Для заполненных слотов, через
+    которые прошёл поиск, хранится ссылка вперёд, и поиск сжимает
+    пройденный путь, так что следующий поиск по той же серии заполненных
+    слотов делает один-два перехода вместо прохода по всей серии.
+
+    Ссылки не сбрасываются: слот, через который они могут перескакивать,
+    при освобождении попадает в отсортированный список освобождённых
+    слотов канала, и поиск проверяет его бинарным поиском (O(log F), где
+    F - число таких слотов). Ограничение limit не даёт поиску уйти дальше
+    заданного слота.
+    """
+
+    def __init__(self, slot_seconds: float = 1):
+        self.slot_seconds: float = slot_seconds
+        self._load: Dict[Tuple[str, int], int] = {}
+        self._next: Dict[str, Dict[int, int]] = {}
+        self._freed: Dict[str, List[int]] = {}
+
+    def slot(self, when: datetime) -> int:
+        return int(when.timestamp() // self.slot_seconds)
+
+    def load(self, channel: str, slot: int) -> int:
+        return self._load.get((channel, slot), 0)
+
+    def add(self, channel: str, slot: int) -> None:
+        key = (channel, slot)
+        self._load[key] = self._load.get(key, 0) + 1
+
+    def remove(self, channel: str, slot: int) -> None:
+        key = (channel, slot)
+        count = self._load.get(key, 0) - 1
+        if count > 0:
+            self._load[key] = count
+        else:
+            self._load.pop(key, None)
+
+        # ссылка есть у каждого слота, через который поиск прошёл как через
+        # заполненный, - только через такие слоты и могут перескакивать ссылки
+        pointers = self._next.get(channel)
+        if pointers is None or slot not in pointers:
+            return
+        if count <= 0:
+            del pointers[slot]
+
+        freed = self._freed.setdefault(channel, [])
+        position = bisect_left(freed, slot)
+        if position == len(freed) or freed[position] != slot:
+            freed.insert(position, slot)
+
+    def prune(self, channel: str, before: int) -> None:
+        """Забывает освобождённые слоты раньше before - они уже в прошлом."""
+        freed = self._freed.get(channel)
+        if freed:
+            del freed[: bisect_left(freed, before)]
+
+    def find_free(
+        self, channel: str, slot: int, capacity: int, limit: Optional[int] = None
+    ) -> int:
+        """
+        Возвращает первый слот >= slot, в котором меньше capacity уведомлений.
+        Если задан limit и до него свободного слота нет, возвращает слот >= limit.
+        """
+        start = slot
+        pointers = self._next.setdefault(channel, {})
+        path: List[int] = []
+        while self.load(channel, slot) >= capacity and (limit is None or slot < limit):
+            path.append(slot)
+            slot = pointers.get(slot, slot + 1)
+        for passed in path:
+            pointers[passed] = slot
+
+        freed = self._freed.get(channel)
+        if not freed:
+            return slot
+
+        position = bisect_left(freed, start)
+        while position < len(freed) and freed[position] < slot:
+            candidate = freed[position]
+            if self.load(channel, candidate) < capacity:
+                return candidate
+            # слот снова заполнен: ссылки через него верны, он выходит из списка
+            # и получает свою ссылку, чтобы remove снова его заметил
+            del freed[position]
+            pointers.setdefault(candidate, candidate + 1)
+        return slot
+
+
+class AdmissionController:
+    """
+    Проверяет, укладывается ли новое уведомление в пропускную способность
+    канала (rates, уведомлений в секунду) в выбранном слоте. При перегрузке,
+    в зависимости от политики, отклоняет запрос, отклоняет его с ближайшим
+    свободным временем или сам переносит уведомление на случайный слот в
+    пределах jitter_window секунд.
+
+    Проверка запрошенного слота - O(1). Поиски при spread ограничены концом
+    окна, поэтому стоят не больше O(jitter_window / slot_seconds); подсказка
+    при переполнении окна ищется одним поиском от конца окна.
+    """
+
+    def __init__(
+        self,
+        rates: Dict[str, float],
+        default_rate: float = 10,
+        slot_seconds: float = 1,
+        jitter_window: float = 60,
+        policy: str = AdmissionPolicy.SUGGEST.value,
+    ):
+        self.rates: Dict[str, float] = rates
+        self.default_rate: float = default_rate
+        self.jitter_slots: int = max(1, int(jitter_window // slot_seconds))
+        self.policy: AdmissionPolicy = AdmissionPolicy(policy)
+        self._index: SlotLoadIndex = SlotLoadIndex(slot_seconds)
+
+    def capacity(self, channel: str) -> int:
+        rate = self.rates.get(channel, self.default_rate)
+        return max(1, int(rate * self._index.slot_seconds))
+
+    def admit(
+        self,
+        channel: str,
+        when: datetime,
+        policy: Optional[str] = None,
+    ) -> AdmissionDecision:
+        """
+        Принимает решение по уведомлению на время when и при успехе
+        учитывает его в индексе.
+        """
+        policy = AdmissionPolicy(policy) if policy else self.policy
+        capacity = self.capacity(channel)
+        slot = self._index.slot(when)
+
+        if self._index.load(channel, slot) < capacity:
+            return self._accept(channel, slot, slot, when)
+
+        match policy:
+            case AdmissionPolicy.REJECT:
+                suggested = None
+            case AdmissionPolicy.SUGGEST:
+                suggested = self._index.find_free(channel, slot, capacity)
+            case AdmissionPolicy.SPREAD:
+                window_end = slot + self.jitter_slots
+                target = slot + random.randrange(self.jitter_slots)
+                free = self._index.find_free(channel, target, capacity, window_end)
+                if free < window_end:
+                    return self._accept(channel, slot, free, when)
+                free = self._index.find_free(channel, slot, capacity, target)
+                if free < target:
+                    return self._accept(channel, slot, free, when)
+                suggested = self._index.find_free(channel, window_end, capacity)
+
+        logger.warning(
+            f"Channel {channel} is over capacity ({capacity}) at {when.isoformat()}"
+        )
+        return AdmissionDecision(
+            accepted=False,
+            channel=channel,
+            scheduled_time=when,
+            suggested_time=(
+                self._shift(when, suggested - slot) if suggested is not None else None
+            ),
+        )
+
+    def release(self, channel: str, when: datetime) -> None:
+        """
+        Убирает из индекса уведомление, запланированное на when. Вызывается,
+        когда время уведомления наступило, поэтому более ранние освобождённые
+        слоты больше не понадобятся.
+        """
+        slot = self._index.slot(when)
+        self._index.remove(channel, slot)
+        self._index.prune(channel, slot)
+
+    def _accept(
+        self, channel: str, slot: int, target: int, when: datetime
+    ) -> AdmissionDecision:
+        self._index.add(channel, target)
+        return AdmissionDecision(
+            accepted=True,
+            channel=channel,
+            scheduled_time=self._shift(when, target - slot),
+        )
+
+    def _shift(self, when: datetime, slots: int) -> datetime:
+        return when + timedelta(seconds=slots * self._index.slot_seconds)
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 import os
+from typing import Any, Dict
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,6 +14,9 @@ class EmailConfig:
     password: str = os.getenv("EMAIL_NOTIFIER_PASS", "")
     use_tls: bool = True
 
+    def is_configured(self) -> bool:
+        return bool(self.username and self.password)
+
 
 @dataclass(frozen=True)
 class SMSConfig:
@@ -20,29 +24,87 @@ class SMSConfig:
     password: str = os.getenv("SMS_NOTIFIER_PASSWORD", "")
     sender: str = os.getenv("SMS_NOTIFIER_SENDER", "")
 
+    def is_configured(self) -> bool:
+        return bool(self.username and self.password)
+
 
 @dataclass(frozen=True)
 class TelegramConfig:
     token: str = os.getenv("TG_NOTIFIER_BOT_TOKEN", "")
 
+    def is_configured(self) -> bool:
+        return bool(self.token)
+
+
+@dataclass(frozen=True)
+class WebhookConfig:
+    batch_window: float = float(os.getenv("WEBHOOK_BATCH_WINDOW", "0.5"))
+    max_batch_size: int = int(os.getenv("WEBHOOK_MAX_BATCH_SIZE", "100"))
+    max_retries: int = int(os.getenv("WEBHOOK_MAX_RETRIES", "5"))
+    backoff_base: float = float(os.getenv("WEBHOOK_BACKOFF_BASE", "0.5"))
+    backoff_max: float = float(os.getenv("WEBHOOK_BACKOFF_MAX", "30"))
+    timeout: float = float(os.getenv("WEBHOOK_TIMEOUT", "10"))
+    pool_limit: int = int(os.getenv("WEBHOOK_POOL_LIMIT", "100"))
+    pool_limit_per_host: int = int(os.getenv("WEBHOOK_POOL_LIMIT_PER_HOST", "10"))
+    keepalive_timeout: float = float(os.getenv("WEBHOOK_KEEPALIVE_TIMEOUT", "30"))
+    secret: str = os.getenv("WEBHOOK_SECRET", "")
+
+
+@dataclass(frozen=True)
+class AdmissionConfig:
+    policy: str = os.getenv("ADMISSION_POLICY", "suggest")
+    slot_seconds: float = float(os.getenv("ADMISSION_SLOT_SECONDS", "1"))
+    jitter_window: float = float(os.getenv("ADMISSION_JITTER_WINDOW", "60"))
+    default_rate: float = float(os.getenv("ADMISSION_DEFAULT_RATE", "10"))
+    email_rate: float = float(os.getenv("EMAIL_NOTIFIER_RATE", "5"))
+    sms_rate: float = float(os.getenv("SMS_NOTIFIER_RATE", "10"))
+    telegram_rate: float = float(os.getenv("TG_NOTIFIER_RATE", "30"))
+
+    @property
+    def rates(self) -> Dict[str, float]:
+        return {
+            "email": self.email_rate,
+            "sms": self.sms_rate,
+            "telegram": self.telegram_rate,
+        }
+
 
 class AppConfig:
     def __init__(self):
         self.email: EmailConfig = EmailConfig()
         self.sms: SMSConfig = SMSConfig()
         self.telegram: TelegramConfig = TelegramConfig()
+        self.webhook: WebhookConfig = WebhookConfig()
+        self.admission: AdmissionConfig = AdmissionConfig()
         self.logger_name = "uvicorn"
+        self._configs: Dict[str, Any] = {}
+        self._aliases: Dict[str, str] = {}
+
+        self.register("email", self.email, "mail")
+        self.register("sms", self.sms, "text")
+        self.register("telegram", self.telegram, "tg")
+
+    def register(self, config_type: str, config: Any, *aliases: str) -> None:
+        """
+        Регистрирует конфиг под именем config_type и дополнительными
+        псевдонимами. Используется сторонними отправителями.
+        """
+        config_type = config_type.lower()
+        self._configs[config_type] = config
+        for alias in aliases:
+            self._aliases[alias.lower()] = config_type
+
+    def __contains__(self, config_type: str) -> bool:
+        config_type = config_type.lower()
+        return self._aliases.get(config_type, config_type) in self._configs
 
     def __getitem__(self, config_type: str):
         config_type = config_type.lower()
-        if config_type in ["email", "mail"]:
-            return self.email
-        elif config_type in ["sms", "text"]:
-            return self.sms
-        elif config_type in ["telegram", "tg"]:
-            return self.telegram
-        else:
-            raise KeyError(f"Unknown config type: {config_type}")
+        config_type = self._aliases.get(config_type, config_type)
+        try:
+            return self._configs[config_type]
+        except KeyError:
+            raise KeyError(f"Unknown config type: {config_type}") from None
 
 
 app_config = AppConfig()
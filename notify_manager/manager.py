@@ -1,49 +1,40 @@
 import logging
 from typing import Dict
-from enum import Enum
-
-from dataclasses import asdict
 
 from .senders.base import AbstractSender
-from .senders.email import EmailSender
-from .senders.sms import SMSSender
-from .senders.tg import TgSender
+# SenderType переехал в senders.registry, импорт из manager сохранён
+from .senders.registry import SenderType, sender_registry  # noqa: F401
 from .config.config import app_config
 
 logger = logging.getLogger(__name__)
 
 
-class SenderType(Enum):
-    EMAIL = "email"
-    SMS = "sms"
-    TELEGRAM = "telegram"
-
-
 class NotifyManager:
-    SENDER_CLASSES = {
-        SenderType.EMAIL: EmailSender,
-        SenderType.SMS: SMSSender,
-        SenderType.TELEGRAM: TgSender,
-    }
-
     def __init__(self):
-        self._senders: Dict[SenderType, AbstractSender] = {}
+        self._senders: Dict[str, AbstractSender] = {}
         self._initialized = False
         self._config = app_config
+        self._registry = sender_registry
 
     async def initialize(self) -> None:
         """
-        Инициализирует все доступные отправители уведомлений.
+        Инициализирует отправители уведомлений, для которых задана конфигурация.
+        Модули ненастроенных отправителей не импортируются.
         Тестирует подключение для каждого типа и добавляет только рабочие.
         Вызывает исключение, если ни один отправитель не инициализирован.
         """
         if self._initialized:
             return
 
-        for sender_type in SenderType:
+        configured = self._registry.configured()
+        skipped = [spec.name for spec in self._registry if spec not in configured]
+        if skipped:
+            logger.info(f"Senders without configuration are skipped: {skipped}")
+
+        for spec in configured:
+            sender_type = spec.name
             try:
-                config = asdict(app_config[sender_type.value])
-                sender = self.SENDER_CLASSES[sender_type](**config)
+                sender = spec.create()
                 is_connected = None
                 try:
                     async with sender as sn:
@@ -65,10 +56,18 @@ class NotifyManager:
             raise RuntimeError("Failed to initialize services")
 
         logger.info(
-            f"Notify manager has been initialized. Current senders: {[sender.value for sender in self._senders]}"
+            f"Notify manager has been initialized. Current senders: {list(self._senders)}"
         )
         self._initialized = True
 
+    @property
+    def primary_channel(self) -> str:
+        """
+        Канал, через который уведомление уходит в первую очередь; остальные
+        используются только при ошибке, поэтому нагрузка учитывается по нему.
+        """
+        return next(iter(self._senders))
+
     async def send_notify(self, message: str, tg_id: int, email: str, phone: str):
         """
         Отправляет уведомление через доступные каналы (email/SMS/Telegram)
@@ -77,21 +76,11 @@ class NotifyManager:
         result = None
 
         for sender_key in self._senders:
+            kwargs = self._registry[sender_key].build_kwargs(
+                message=message, tg_id=tg_id, email=email, phone=phone
+            )
             async with self._senders[sender_key] as sender:
-                match sender_key:
-                    case SenderType.EMAIL:
-                        result = await sender.send_notify(
-                            to_addrs=[email],
-                            subject="notify",
-                            notify=message,
-                        )
-                    case SenderType.SMS:
-                        result = await sender.send_notify(
-                            phone=phone,
-                            notify=message,
-                        )
-                    case SenderType.TELEGRAM:
-                        result = await sender.send_notify(user_id=tg_id, notify=message)
+                result = await sender.send_notify(**kwargs)
 
             if not result.get("error") and result:
                 return result
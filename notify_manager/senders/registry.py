@@ -0,0 +1,143 @@
+import logging
+import importlib
+from dataclasses import asdict, dataclass
+from enum import Enum
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, Iterator, List, Optional, Type
+
+from .base import AbstractSender
+from ..config.config import app_config
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "notify_sender.senders"
+
+
+class SenderType(Enum):
+    EMAIL = "email"
+    SMS = "sms"
+    TELEGRAM = "telegram"
+
+
+@dataclass(frozen=True)
+class SenderSpec:
+    """
+    Описание отправителя для реестра.
+
+    target - путь к классу в виде "package.module:ClassName". Модуль
+    импортируется только при создании отправителя, поэтому зависимости
+    ненастроенных каналов (aiogram, aiosmtplib, aiohttp) не загружаются.
+    build_kwargs получает message, tg_id, email, phone и возвращает аргументы
+    для send_notify отправителя.
+    """
+
+    name: str
+    target: str
+    config_type: str
+    build_kwargs: Callable[..., Dict[str, Any]]
+    config_class: Optional[Type] = None
+
+    @property
+    def config(self) -> Any:
+        return app_config[self.config_type]
+
+    def is_configured(self) -> bool:
+        is_configured = getattr(self.config, "is_configured", None)
+        return is_configured() if is_configured else True
+
+    def load(self) -> Type[AbstractSender]:
+        module_name, _, class_name = self.target.partition(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
+    def create(self) -> AbstractSender:
+        return self.load()(**asdict(self.config))
+
+
+class SenderRegistry:
+    """
+    Реестр отправителей. Встроенные отправители регистрируются ниже,
+    сторонние - через entry points группы notify_sender.senders, значением
+    которых должен быть SenderSpec (или функция без аргументов, возвращающая его).
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, SenderSpec] = {}
+        self._entry_points_loaded: bool = False
+
+    def register(self, spec: SenderSpec) -> None:
+        if spec.config_type not in app_config:
+            if spec.config_class is None:
+                logger.error(
+                    f"Sender {spec.name} is skipped: unknown config type {spec.config_type}"
+                )
+                return
+            app_config.register(spec.config_type, spec.config_class())
+        if spec.name in self._specs:
+            logger.warning(f"Sender {spec.name} is overridden by {spec.target}")
+        self._specs[spec.name] = spec
+
+    def load_entry_points(self) -> None:
+        if self._entry_points_loaded:
+            return
+
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            try:
+                spec = entry_point.load()
+                if not isinstance(spec, SenderSpec):
+                    spec = spec()
+                if not isinstance(spec, SenderSpec):
+                    raise TypeError(f"expected SenderSpec, got {type(spec).__name__}")
+                self.register(spec)
+            except Exception as err:
+                logger.error(f"Failed to load sender {entry_point.name}: {err}")
+        self._entry_points_loaded = True
+
+    def configured(self) -> List[SenderSpec]:
+        self.load_entry_points()
+
+        configured = []
+        for spec in self._specs.values():
+            try:
+                if spec.is_configured():
+                    configured.append(spec)
+            except Exception as err:
+                logger.error(f"Failed to check configuration of {spec.name}: {err}")
+        return configured
+
+    def __getitem__(self, name: str) -> SenderSpec:
+        return self._specs[name]
+
+    def __iter__(self) -> Iterator[SenderSpec]:
+        return iter(self._specs.values())
+
+
+sender_registry = SenderRegistry()
+
+sender_registry.register(
+    SenderSpec(
+        name=SenderType.EMAIL.value,
+        target="notify_manager.senders.email:EmailSender",
+        config_type="email",
+        build_kwargs=lambda message, email, **_: {
+            "to_addrs": [email],
+            "subject": "notify",
+            "notify": message,
+        },
+    )
+)
+sender_registry.register(
+    SenderSpec(
+        name=SenderType.SMS.value,
+        target="notify_manager.senders.sms:SMSSender",
+        config_type="sms",
+        build_kwargs=lambda message, phone, **_: {"phone": phone, "notify": message},
+    )
+)
+sender_registry.register(
+    SenderSpec(
+        name=SenderType.TELEGRAM.value,
+        target="notify_manager.senders.tg:TgSender",
+        config_type="telegram",
+        build_kwargs=lambda message, tg_id, **_: {"user_id": tg_id, "notify": message},
+    )
+)
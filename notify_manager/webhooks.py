@@ -0,0 +1,268 @@
+import logging
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import random
+import socket
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Notify-Signature"
+TIMESTAMP_HEADER = "X-Notify-Timestamp"
+
+
+def is_public_address(host: str) -> bool:
+    address = ipaddress.ip_address(host)
+    if address.version == 6 and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    return address.is_global and not address.is_multicast
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Разбирает Retry-After (секунды или HTTP-дата) в задержку в секундах."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def validate_callback_url(url: str) -> str:
+    """
+    Проверяет адрес вебхука: только http(s) и не локальные, link-local
+    или приватные адреса. Имена хостов дополнительно проверяются при
+    соединении (см. _public_resolver), чтобы их нельзя было направить
+    на внутренний адрес через DNS.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise ValueError("Адрес вебхука должен использовать http или https")
+
+    host = parts.hostname
+    if not host:
+        raise ValueError("В адресе вебхука не указан хост")
+    if host == "localhost" or host.endswith(".localhost"):
+        raise ValueError("Адрес вебхука не может указывать на локальный хост")
+
+    try:
+        is_public = is_public_address(host)
+    except ValueError:
+        # сокращённые и числовые формы IPv4 (127.1, 2130706433, 0x7f.1)
+        try:
+            packed = socket.inet_aton(host)
+        except OSError:
+            return url
+        is_public = is_public_address(str(ipaddress.IPv4Address(packed)))
+    if not is_public:
+        raise ValueError("Адрес вебхука не может указывать на внутренний адрес")
+    return url
+
+
+def _public_resolver():
+    from aiohttp.resolver import DefaultResolver
+
+    class PublicResolver(DefaultResolver):
+        async def resolve(self, host, port=0, family=socket.AF_INET):
+            hosts = await super().resolve(host, port, family)
+            public = [item for item in hosts if is_public_address(item["host"])]
+            if not public:
+                raise OSError(f"Webhook host {host} resolves to a non-public address")
+            return public
+
+    return PublicResolver()
+
+
+class WebhookDispatcher:
+    """
+    Отправляет клиентам вебхуки об изменении статуса уведомлений.
+
+    События копятся по адресу получателя в течение batch_window секунд и
+    уходят одним POST-запросом ({"events": [...]}) через общий пул keep-alive
+    соединений. enqueue не ждёт сети, поэтому не тормозит отправку уведомлений;
+    доставка с повторами и экспоненциальной задержкой идёт в фоновых задачах.
+
+    Если задан secret, тело запроса подписывается HMAC-SHA256 от
+    "<timestamp>.<body>"; подпись и время передаются в заголовках
+    X-Notify-Signature ("sha256=<hex>") и X-Notify-Timestamp.
+    """
+
+    def __init__(
+        self,
+        batch_window: float = 0.5,
+        max_batch_size: int = 100,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30,
+        timeout: float = 10,
+        pool_limit: int = 100,
+        pool_limit_per_host: int = 10,
+        keepalive_timeout: float = 30,
+        secret: str = "",
+    ):
+        self.batch_window: float = batch_window
+        self.max_batch_size: int = max_batch_size
+        self.max_retries: int = max_retries
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.timeout: float = timeout
+        self.pool_limit: int = pool_limit
+        self.pool_limit_per_host: int = pool_limit_per_host
+        self.keepalive_timeout: float = keepalive_timeout
+        self.secret: str = secret
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._closed: bool = False
+
+    def enqueue(self, url: str, event: Dict[str, Any]) -> None:
+        """
+        Ставит событие в пакет для url. Пакет отправляется по истечении
+        batch_window или сразу, если набралось max_batch_size событий.
+        """
+        if self._closed:
+            logger.warning(f"WebhookDispatcher is closed, event for {url} dropped")
+            return
+
+        batch = self._pending.setdefault(url, [])
+        batch.append(event)
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(url)
+        elif url not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[url] = loop.call_later(self.batch_window, self._flush, url)
+
+    async def close(self) -> None:
+        """
+        Отправляет накопленные пакеты, ждёт незавершённые доставки
+        (не дольше timeout) и закрывает пул соединений.
+        """
+        self._closed = True
+
+        for url in list(self._pending):
+            self._flush(url)
+
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=self.timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(
+                    f"WebhookDispatcher closed with {len(pending)} undelivered batches"
+                )
+
+        if self._session:
+            try:
+                await self._session.close()
+            except Exception as err:
+                logger.warning(err)
+            finally:
+                self._session = None
+                logger.info("WebhookDispatcher session closed")
+
+    def _flush(self, url: str) -> None:
+        timer = self._timers.pop(url, None)
+        if timer:
+            timer.cancel()
+
+        batch = self._pending.pop(url, None)
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._deliver(url, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            # aiohttp импортируется при первой отправке, а не при старте сервиса
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_limit,
+                limit_per_host=self.pool_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                resolver=_public_resolver(),
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            logger.info("WebhookDispatcher session created")
+        return self._session
+
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after)
+        delay = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _headers(self, body: bytes) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.secret:
+            timestamp = str(int(time.time()))
+            signature = hmac.new(
+                self.secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256
+            ).hexdigest()
+            headers[TIMESTAMP_HEADER] = timestamp
+            headers[SIGNATURE_HEADER] = f"sha256={signature}"
+        return headers
+
+    async def _deliver(self, url: str, batch: List[Dict[str, Any]]) -> None:
+        body = json.dumps({"events": batch}, ensure_ascii=False).encode()
+        error = None
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with self._get_session().post(
+                    url,
+                    data=body,
+                    headers=self._headers(body),
+                    allow_redirects=False,
+                ) as response:
+                    if 200 <= response.status < 300:
+                        logger.info(f"Webhook sent to {url}: {len(batch)} events")
+                        return
+                    error = f"HTTP {response.status}"
+                    if response.status != 429 and response.status < 500:
+                        logger.error(
+                            f"Webhook to {url} rejected ({error}), {len(batch)} events dropped"
+                        )
+                        return
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                error = err
+
+            if attempt < self.max_retries:
+                delay = self._backoff(attempt, retry_after)
+                logger.warning(
+                    f"Webhook to {url} failed ({error}), retry {attempt + 1} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+        logger.error(
+            f"Webhook to {url} failed after {self.max_retries + 1} attempts ({error}), "
+            f"{len(batch)} events dropped"
+        )
@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta
+
+from notify_manager.admission import AdmissionController, SlotLoadIndex
+
+CHANNEL = "telegram"
+WHEN = datetime(2030, 1, 1, 12, 0, 0)
+
+
+def make_controller(**kwargs) -> AdmissionController:
+    kwargs.setdefault("rates", {CHANNEL: 2})
+    kwargs.setdefault("jitter_window", 5)
+    return AdmissionController(**kwargs)
+
+
+def fill(controller: AdmissionController, when: datetime, count: int = 2) -> None:
+    for _ in range(count):
+        assert controller.admit(CHANNEL, when, "reject").accepted
+
+
+def test_accepts_until_capacity():
+    controller = make_controller()
+
+    decision = controller.admit(CHANNEL, WHEN)
+
+    assert decision.accepted
+    assert decision.channel == CHANNEL
+    assert decision.scheduled_time == WHEN
+
+
+def test_reject_without_suggestion():
+    controller = make_controller()
+    fill(controller, WHEN)
+
+    decision = controller.admit(CHANNEL, WHEN, "reject")
+
+    assert not decision.accepted
+    assert decision.suggested_time is None
+
+
+def test_suggest_nearest_free_slot():
+    controller = make_controller()
+    fill(controller, WHEN)
+    fill(controller, WHEN + timedelta(seconds=1))
+
+    decision = controller.admit(CHANNEL, WHEN, "suggest")
+
+    assert not decision.accepted
+    assert decision.suggested_time == WHEN + timedelta(seconds=2)
+
+
+def test_spread_within_jitter_window():
+    controller = make_controller()
+    fill(controller, WHEN)
+
+    decisions = [controller.admit(CHANNEL, WHEN, "spread") for _ in range(8)]
+
+    assert all(decision.accepted for decision in decisions)
+    times = sorted(decision.scheduled_time for decision in decisions)
+    assert times == [WHEN + timedelta(seconds=s) for s in (1, 1, 2, 2, 3, 3, 4, 4)]
+
+
+def test_spread_full_window_suggests_slot_after_window():
+    controller = make_controller()
+    for second in range(5):
+        fill(controller, WHEN + timedelta(seconds=second))
+
+    decision = controller.admit(CHANNEL, WHEN, "spread")
+
+    assert not decision.accepted
+    assert decision.suggested_time == WHEN + timedelta(seconds=5)
+
+
+def test_release_frees_slot():
+    controller = make_controller()
+    fill(controller, WHEN)
+
+    controller.release(CHANNEL, WHEN)
+
+    assert controller.admit(CHANNEL, WHEN, "reject").accepted
+
+
+def test_find_free_after_release_of_skipped_slot():
+    index = SlotLoadIndex()
+    for slot in range(3):
+        index.add(CHANNEL, slot)
+
+    assert index.find_free(CHANNEL, 0, capacity=1) == 3
+    index.remove(CHANNEL, 1)
+
+    assert index.find_free(CHANNEL, 0, capacity=1) == 1
+
+
+def test_channels_are_independent():
+    controller = make_controller()
+    fill(controller, WHEN)
+
+    assert controller.admit("email", WHEN, "reject").accepted
+
+
+def test_find_free_after_refill_and_second_release():
+    index = SlotLoadIndex()
+    for slot in range(3):
+        index.add(CHANNEL, slot)
+    index.find_free(CHANNEL, 0, capacity=1)
+
+    index.remove(CHANNEL, 1)
+    assert index.find_free(CHANNEL, 0, capacity=1) == 1
+    index.add(CHANNEL, 1)
+    assert index.find_free(CHANNEL, 0, capacity=1) == 3
+    index.remove(CHANNEL, 1)
+
+    assert index.find_free(CHANNEL, 0, capacity=1) == 1
+
+
+def test_find_free_respects_limit():
+    index = SlotLoadIndex()
+    for slot in range(10):
+        index.add(CHANNEL, slot)
+
+    assert index.find_free(CHANNEL, 0, capacity=1, limit=4) == 4
+    assert index.find_free(CHANNEL, 0, capacity=1) == 10
+
+
+def count_loads(monkeypatch) -> list:
+    calls = [0]
+    load = SlotLoadIndex.load
+
+    def counting_load(self, channel, slot):
+        calls[0] += 1
+        return load(self, channel, slot)
+
+    monkeypatch.setattr(SlotLoadIndex, "load", counting_load)
+    return calls
+
+
+def test_release_does_not_rewalk_full_run(monkeypatch):
+    controller = make_controller(rates={CHANNEL: 1})
+    for second in range(1000):
+        fill(controller, WHEN + timedelta(seconds=second), count=1)
+    controller.admit(CHANNEL, WHEN, "suggest")
+    calls = count_loads(monkeypatch)
+
+    controller.release(CHANNEL, WHEN + timedelta(seconds=500))
+    decision = controller.admit(CHANNEL, WHEN, "suggest")
+
+    assert decision.suggested_time == WHEN + timedelta(seconds=500)
+    assert calls[0] < 10
+
+
+def test_spread_with_full_window_is_bounded(monkeypatch):
+    controller = make_controller(rates={CHANNEL: 1})
+    for second in range(1000):
+        fill(controller, WHEN + timedelta(seconds=second), count=1)
+    controller.admit(CHANNEL, WHEN, "spread")
+    calls = count_loads(monkeypatch)
+
+    decision = controller.admit(CHANNEL, WHEN, "spread")
+
+    assert not decision.accepted
+    assert decision.suggested_time == WHEN + timedelta(seconds=1000)
+    assert calls[0] < 20
@@ -0,0 +1,148 @@
+import logging
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from notify_manager.config.config import app_config
+from notify_manager.senders import registry
+from notify_manager.senders.registry import SenderRegistry, SenderSpec
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass(frozen=True)
+class PushConfig:
+    token: str = "push-token"
+
+
+class FakeEntryPoint:
+    def __init__(self, name, load):
+        self.name = name
+        self._load = load
+
+    def load(self):
+        return self._load()
+
+
+def make_spec(name="push", config_type="push", config_class=None) -> SenderSpec:
+    return SenderSpec(
+        name=name,
+        target="push_sender:PushSender",
+        config_type=config_type,
+        config_class=config_class,
+        build_kwargs=lambda message, **_: {"notify": message},
+    )
+
+
+@pytest.fixture
+def isolated_config(monkeypatch):
+    monkeypatch.setattr(app_config, "_configs", dict(app_config._configs))
+    monkeypatch.setattr(app_config, "_aliases", dict(app_config._aliases))
+
+
+def use_entry_points(monkeypatch, *items):
+    monkeypatch.setattr(registry, "entry_points", lambda group: list(items))
+
+
+def test_configured_imports_only_configured_sender_modules():
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if not key.startswith(("EMAIL_NOTIFIER_", "SMS_NOTIFIER_", "TG_NOTIFIER_"))
+    }
+    # пустые значения, чтобы load_dotenv не подставил их из .env проекта
+    env.update(
+        EMAIL_NOTIFIER_LOGIN="",
+        EMAIL_NOTIFIER_PASS="",
+        SMS_NOTIFIER_LOGIN="",
+        SMS_NOTIFIER_PASSWORD="",
+        TG_NOTIFIER_BOT_TOKEN="token",
+    )
+    code = (
+        "import sys\n"
+        "from notify_manager.manager import sender_registry\n"
+        "print(','.join(spec.name for spec in sender_registry.configured()))\n"
+        "print(','.join(sorted(sys.modules)))\n"
+    )
+
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+
+    assert output[0] == "telegram"
+    modules = set(output[1].split(","))
+    for module in (
+        "aiosmtplib",
+        "aiohttp",
+        "notify_manager.senders.email",
+        "notify_manager.senders.sms",
+    ):
+        assert module not in modules
+
+
+def test_entry_point_that_raises_is_skipped(monkeypatch, caplog):
+    def broken():
+        raise ImportError("no module named push_sender")
+
+    use_entry_points(monkeypatch, FakeEntryPoint("push", broken))
+    sender_registry = SenderRegistry()
+
+    with caplog.at_level(logging.ERROR, logger=registry.__name__):
+        assert sender_registry.configured() == []
+
+    assert "Failed to load sender push" in caplog.text
+
+
+def test_entry_point_returning_non_spec_is_skipped(monkeypatch, caplog):
+    def factory():
+        return {"name": "push"}
+
+    use_entry_points(monkeypatch, FakeEntryPoint("push", lambda: factory))
+    sender_registry = SenderRegistry()
+
+    with caplog.at_level(logging.ERROR, logger=registry.__name__):
+        assert sender_registry.configured() == []
+
+    assert "expected SenderSpec" in caplog.text
+
+
+def test_entry_point_spec_is_registered(monkeypatch, isolated_config):
+    spec = make_spec(config_class=PushConfig)
+    use_entry_points(monkeypatch, FakeEntryPoint("push", lambda: spec))
+    sender_registry = SenderRegistry()
+
+    assert sender_registry.configured() == [spec]
+
+
+def test_spec_with_unknown_config_type_is_skipped(caplog):
+    sender_registry = SenderRegistry()
+
+    with caplog.at_level(logging.ERROR, logger=registry.__name__):
+        sender_registry.register(make_spec(config_type="unknown"))
+
+    assert list(sender_registry) == []
+    assert "unknown config type unknown" in caplog.text
+
+
+def test_config_class_is_registered_in_app_config(isolated_config):
+    sender_registry = SenderRegistry()
+
+    sender_registry.register(make_spec(config_class=PushConfig))
+
+    assert app_config["push"] == PushConfig()
+    assert sender_registry["push"].config == PushConfig()
+
+
+def test_sender_type_is_importable_from_manager():
+    from notify_manager.manager import SenderType
+
+    assert SenderType.TELEGRAM.value == "telegram"
@@ -0,0 +1,293 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import sys
+import types
+
+import pytest
+
+from notify_manager import webhooks
+from notify_manager.webhooks import (
+    SIGNATURE_HEADER,
+    TIMESTAMP_HEADER,
+    WebhookDispatcher,
+    parse_retry_after,
+    validate_callback_url,
+)
+
+URL = "https://example.com/hook"
+
+
+class FakeResponse:
+    def __init__(self, status=200, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class FakeSession:
+    """Отвечает по очереди ответами из responses; исключение выбрасывается."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.closed = False
+
+    def post(self, url, data, headers, allow_redirects):
+        self.requests.append(
+            {"url": url, "events": json.loads(data)["events"], "headers": headers}
+        )
+        response = self.responses.pop(0) if self.responses else FakeResponse()
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def close(self):
+        self.closed = True
+
+
+def make_dispatcher(*responses, **kwargs):
+    kwargs.setdefault("backoff_base", 0)
+    dispatcher = WebhookDispatcher(**kwargs)
+    dispatcher._session = FakeSession(*responses)
+    return dispatcher
+
+
+async def drain(dispatcher):
+    while dispatcher._tasks:
+        await asyncio.gather(*dispatcher._tasks)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://example.com/hook",
+        "http://example.com:8080/hook?x=1",
+        "http://8.8.8.8/",
+        "http://[2001:4860:4860::8888]/",
+    ],
+)
+def test_validate_callback_url_accepts_public(url):
+    assert validate_callback_url(url) == url
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "ftp://example.com/",
+        "file:///etc/passwd",
+        "http:///path",
+        "http://localhost:8000/",
+        "http://api.localhost/",
+        "http://127.0.0.1/",
+        "http://127.1/",
+        "http://2130706433/",
+        "http://0x7f.1/",
+        "http://0.0.0.0/",
+        "http://10.0.0.5/",
+        "http://172.16.0.1/",
+        "http://192.168.1.1/",
+        "http://169.254.169.254/latest/meta-data",
+        "http://100.64.0.1/",
+        "http://224.0.0.1/",
+        "http://[::1]/",
+        "http://[fe80::1]/",
+        "http://[fc00::1]/",
+        "http://[::ffff:127.0.0.1]/",
+    ],
+)
+def test_validate_callback_url_rejects_internal(url):
+    with pytest.raises(ValueError):
+        validate_callback_url(url)
+
+
+@pytest.fixture
+def fake_resolver(monkeypatch):
+    """Подменяет aiohttp.resolver.DefaultResolver резолвером с заданными адресами."""
+    addresses = []
+
+    class DefaultResolver:
+        async def resolve(self, host, port=0, family=None):
+            return [{"hostname": host, "host": address} for address in addresses]
+
+    aiohttp = types.ModuleType("aiohttp")
+    resolver = types.ModuleType("aiohttp.resolver")
+    resolver.DefaultResolver = DefaultResolver
+    aiohttp.resolver = resolver
+    monkeypatch.setitem(sys.modules, "aiohttp", aiohttp)
+    monkeypatch.setitem(sys.modules, "aiohttp.resolver", resolver)
+    return addresses
+
+
+def test_public_resolver_drops_internal_addresses(fake_resolver):
+    fake_resolver.extend(["10.0.0.1", "93.184.216.34", "127.0.0.1"])
+
+    hosts = asyncio.run(webhooks._public_resolver().resolve("example.com", 443))
+
+    assert [item["host"] for item in hosts] == ["93.184.216.34"]
+
+
+def test_public_resolver_rejects_only_internal_addresses(fake_resolver):
+    fake_resolver.extend(["169.254.169.254", "::1"])
+
+    with pytest.raises(OSError):
+        asyncio.run(webhooks._public_resolver().resolve("internal.example", 80))
+
+
+def test_flush_when_max_batch_size_reached():
+    async def scenario():
+        dispatcher = make_dispatcher(batch_window=60, max_batch_size=2)
+        dispatcher.enqueue(URL, {"id": 1})
+        dispatcher.enqueue(URL, {"id": 2})
+        await drain(dispatcher)
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+
+    batches = [request["events"] for request in dispatcher._session.requests]
+    assert batches == [[{"id": 1}, {"id": 2}]]
+    assert dispatcher._timers == {}
+
+
+def test_events_coalesced_per_url_within_window():
+    other = "https://example.org/hook"
+
+    async def scenario():
+        dispatcher = make_dispatcher(batch_window=0.01)
+        for event_id in range(3):
+            dispatcher.enqueue(URL, {"id": event_id})
+        dispatcher.enqueue(other, {"id": 3})
+        assert dispatcher._session.requests == []
+        await asyncio.sleep(0.05)
+        await drain(dispatcher)
+        return dispatcher
+
+    requests = asyncio.run(scenario())._session.requests
+
+    batches = {request["url"]: request["events"] for request in requests}
+    assert len(requests) == 2
+    assert batches[URL] == [{"id": 0}, {"id": 1}, {"id": 2}]
+    assert batches[other] == [{"id": 3}]
+
+
+def test_client_error_is_dropped_without_retry():
+    async def scenario():
+        dispatcher = make_dispatcher(FakeResponse(400), FakeResponse(200))
+        await dispatcher._deliver(URL, [{"id": 1}])
+        return dispatcher
+
+    assert len(asyncio.run(scenario())._session.requests) == 1
+
+
+def test_redirect_is_not_treated_as_delivered():
+    async def scenario():
+        dispatcher = make_dispatcher(FakeResponse(302), FakeResponse(200))
+        await dispatcher._deliver(URL, [{"id": 1}])
+        return dispatcher
+
+    assert len(asyncio.run(scenario())._session.requests) == 1
+
+
+def test_retries_on_server_errors_rate_limit_and_network_errors():
+    async def scenario():
+        dispatcher = make_dispatcher(
+            FakeResponse(503),
+            FakeResponse(429),
+            OSError("connection reset"),
+            FakeResponse(200),
+        )
+        await dispatcher._deliver(URL, [{"id": 1}])
+        return dispatcher
+
+    assert len(asyncio.run(scenario())._session.requests) == 4
+
+
+def test_gives_up_after_max_retries():
+    async def scenario():
+        dispatcher = make_dispatcher(*[FakeResponse(500)] * 10, max_retries=2)
+        await dispatcher._deliver(URL, [{"id": 1}])
+        return dispatcher
+
+    assert len(asyncio.run(scenario())._session.requests) == 3
+
+
+def test_retry_after_is_used_instead_of_backoff():
+    async def scenario():
+        dispatcher = make_dispatcher(
+            FakeResponse(429, {"Retry-After": "0"}),
+            FakeResponse(200),
+            backoff_base=100,
+        )
+        await asyncio.wait_for(dispatcher._deliver(URL, [{"id": 1}]), timeout=1)
+        return dispatcher
+
+    assert len(asyncio.run(scenario())._session.requests) == 2
+
+
+def test_retry_after_is_capped_by_backoff_max():
+    dispatcher = WebhookDispatcher(backoff_max=5)
+
+    assert dispatcher._backoff(0, retry_after=120) == 5
+    assert dispatcher._backoff(0, retry_after=1.5) == 1.5
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("120", 120.0), ("0", 0.0), (None, None), ("soon", None)],
+)
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2099 07:28:00 GMT") > 0
+
+
+def test_close_flushes_pending_batches_and_closes_session():
+    async def scenario():
+        dispatcher = make_dispatcher(batch_window=60)
+        session = dispatcher._session
+        dispatcher.enqueue(URL, {"id": 1})
+        await dispatcher.close()
+        dispatcher.enqueue(URL, {"id": 2})
+        return dispatcher, session
+
+    dispatcher, session = asyncio.run(scenario())
+
+    assert [r["events"] for r in session.requests] == [[{"id": 1}]]
+    assert session.closed
+    assert dispatcher._session is None
+    assert dispatcher._pending == {}
+
+
+def test_payload_is_signed_with_secret():
+    async def scenario():
+        dispatcher = make_dispatcher(secret="s3cret")
+        await dispatcher._deliver(URL, [{"id": 1}])
+        return dispatcher
+
+    headers = asyncio.run(scenario())._session.requests[0]["headers"]
+
+    body = json.dumps({"events": [{"id": 1}]}).encode()
+    expected = hmac.new(
+        b"s3cret", headers[TIMESTAMP_HEADER].encode() + b"." + body, hashlib.sha256
+    ).hexdigest()
+    assert headers[SIGNATURE_HEADER] == f"sha256={expected}"
+
+
+def test_payload_is_not_signed_without_secret():
+    async def scenario():
+        dispatcher = make_dispatcher()
+        await dispatcher._deliver(URL, [{"id": 1}])
+        return dispatcher
+
+    headers = asyncio.run(scenario())._session.requests[0]["headers"]
+
+    assert SIGNATURE_HEADER not in headers